@@ -1,29 +1,79 @@
 from abc import ABC, abstractmethod
-from collections.abc import Sequence
-from typing import Union
+import operator
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, SupportsIndex, Union
 
 import xarray as xr
+import zarr
+
+MAX_PREFETCH_WORKERS = 8
 
 
 class MultiscaleBase(Sequence, ABC):
+    __slots__ = ()
+
     @abstractmethod
     def ndim(self) -> int:
         pass
 
     @abstractmethod
     def _get_item(self, idx: int):
-        if not (-len(self) < idx < len(self)):
+        if not (0 <= idx < len(self)):
             raise IndexError("index out of range")
 
+    @abstractmethod
+    def _get_array(self, idx: int) -> zarr.Array:
+        """Get the zarr array of a scale level, opening it if necessary."""
+        pass
+
+    @abstractmethod
+    def _is_open(self, idx: int) -> bool:
+        """Whether the zarr array of a scale level has already been opened."""
+        pass
+
+    def prefetch(self, indices: Optional[Iterable[int]] = None):
+        """Concurrently open the arrays of the given scale levels.
+
+        Later lookups of those levels do not need to read array metadata,
+        which is slow for remote stores.
+
+        Parameters
+        ----------
+        indices : Iterable[int], optional
+            Scale levels to open (default all).
+        """
+        levels = range(len(self))
+        if indices is None:
+            indices = levels
+        to_open = {levels[idx] for idx in indices}
+        to_open = [idx for idx in sorted(to_open) if not self._is_open(idx)]
+
+        if len(to_open) <= 1:
+            for idx in to_open:
+                self._get_array(idx)
+            return
+
+        n_workers = min(len(to_open), MAX_PREFETCH_WORKERS)
+        with ThreadPoolExecutor(n_workers) as executor:
+            for _ in executor.map(self._get_array, to_open):
+                pass
+
     def __getitem__(
-        self, idx: Union[int, slice]
+        self, idx: Union[SupportsIndex, slice]
     ) -> Union[xr.DataArray, list[xr.DataArray]]:
-        if isinstance(idx, int):
+        try:
+            idx = operator.index(idx)
+        except TypeError:
+            pass
+        else:
+            if idx < 0:
+                idx += len(self)
             return self._get_item(idx)
 
-        out = []
-        start, stop, stride = idx.indices(len(self))
-        while start < stop:
-            out.append(self._get_item(start))
-            start += stride
-        return out
+        if isinstance(idx, slice):
+            indices = range(*idx.indices(len(self)))
+            self.prefetch(indices)
+            return [self._get_item(i) for i in indices]
+
+        raise TypeError(f"indices must be integers or slices, not {type(idx)}")
@@ -1,46 +1,136 @@
+from functools import cached_property
 from typing import Optional, Union
 import logging
 
-from pydantic import BaseModel, root_validator, ValidationError
+import msgspec
 import numpy as np
+from numpy.typing import DTypeLike
 import zarr
 import xarray as xr
-import dask.array as da
 
 from .base import MultiscaleBase
+from .utils import (
+    UNITS_ATTR,
+    LazyMode,
+    array_data,
+    cache_store,
+    to_coordinates,
+    unwrap_store,
+)
 
 logger = logging.getLogger(__name__)
 
 
-class SharedMetadata(BaseModel):
+class SharedMetadata(msgspec.Struct, kw_only=True, dict=True):
     """Optional neuroglancer-specific metadata."""
 
     axes: Optional[list[str]] = None
     coordinateArrays: Optional[dict[str, list[str]]] = None
 
-    @root_validator
-    def check_axes(cls, values):
-        if not values.get("coordinateArrays"):
+    def __post_init__(self):
+        if not self.coordinateArrays:
             # nothing to validate
-            return values
+            return
 
-        if values.get("axes") is None:
+        if self.axes is None:
             # can only reach this point if coordinateArrays given
             raise ValueError("coordinateArrays given, but no axes")
 
-        for k in values["coordinateArrays"]:
-            if k not in values["axes"]:
+        for k in self.coordinateArrays:
+            if k not in self.axes:
                 raise ValueError("Unknown axis")
 
-        return values
-
     def coordinate_array(self, axis: str) -> Optional[list[str]]:
         if self.axes is None or self.coordinateArrays is None:
             return None
         return self.coordinateArrays.get(axis)
 
+    def ndim(self) -> int:
+        raise NotImplementedError()
+
+    def n_scales(self) -> int:
+        raise NotImplementedError()
+
+    def unit(self, n5_idx: int) -> str:
+        """Unit of the axis at the given index, in N5 (F) order."""
+        raise NotImplementedError()
+
+    @cached_property
+    def _reversed_scales(self) -> list[np.ndarray]:
+        """World-space resolution of each scale level, in C order."""
+        raise NotImplementedError()
+
+    @cached_property
+    def _axis_names(self) -> tuple[str, ...]:
+        """Axis names in C order, defaulting to dim_{idx}."""
+        names = [None] * self.ndim() if self.axes is None else self.axes[::-1]
+        return tuple(name or f"dim_{idx}" for idx, name in enumerate(names))
+
+    @cached_property
+    def _axis_labels(self) -> tuple[Optional[list[str]], ...]:
+        """Coordinate arrays of each axis in C order, if any."""
+        if self.axes is None:
+            return (None,) * self.ndim()
+        return tuple(self.coordinate_array(name) for name in self.axes[::-1])
+
+    @cached_property
+    def _axis_units(self) -> tuple[str, ...]:
+        """Units of each axis in C order."""
+        ndim = self.ndim()
+        return tuple(self.unit(ndim - idx - 1) for idx in range(ndim))
+
+    def to_coords(
+        self, scale_idx: int, shape: tuple[int, ...], dtype: DTypeLike = np.float64
+    ) -> list[xr.DataArray]:
+        """Coordinate arrays for the given scale level, in C order.
+
+        Parameters
+        ----------
+        scale_idx : int
+            Index of the scale level.
+        shape : tuple[int, ...]
+            Shape of the scale level's array, in C order.
+        dtype : numpy dtype, optional
+            Floating-point dtype of the coordinates (default float64).
+
+        Returns
+        -------
+        list[xr.DataArray]
+        """
+        if len(shape) != self.ndim():
+            raise ValueError("Inconsistent dimensionality")
+        return [
+            _axis_coord(*args, dtype)
+            for args in zip(
+                self._axis_names,
+                self._axis_labels,
+                self._axis_units,
+                shape,
+                self._reversed_scales[scale_idx],
+            )
+        ]
+
+    def dim_names(self) -> list[str]:
+        return list(self._axis_names)
+
+
+def _axis_coord(
+    name: str,
+    labels: Optional[list[str]],
+    unit: str,
+    size: int,
+    resolution: float,
+    dtype: DTypeLike,
+) -> xr.DataArray:
+    if labels is not None:
+        return xr.DataArray(labels, dims=(name,), name=name)
+
+    coord_arr = np.arange(size, dtype=dtype)
+    coord_arr *= coord_arr.dtype.type(resolution)
+    return xr.DataArray(coord_arr, dims=(name,), name=name, attrs={UNITS_ATTR: unit})
 
-class PixelResolution(BaseModel):
+
+class PixelResolution(msgspec.Struct):
     unit: str
     dimensions: list[float]
 
@@ -52,67 +142,36 @@ class N5ViewerMetadata(SharedMetadata):
     scales: list[list[float]]
     pixelResolution: PixelResolution
 
-    @root_validator
-    def check_ndim(cls, values):
+    def __post_init__(self):
+        super().__post_init__()
+
         ndim = None
-        if values.get("axes") is not None:
-            ndim = len(values["axes"])
+        if self.axes is not None:
+            ndim = len(self.axes)
 
-        pr_ndim = len(values["pixelResolution"].dimensions)
+        pr_ndim = len(self.pixelResolution.dimensions)
         if ndim is None:
             ndim = pr_ndim
         elif ndim != pr_ndim:
             raise ValueError("Inconsistent dimensionality")
 
-        for row in values["scales"]:
+        for row in self.scales:
             if len(row) != ndim:
                 raise ValueError("Inconsistent dimensionality")
 
-        return values
-
     def ndim(self):
         return self.pixelResolution.ndim()
 
-    def to_coords(self, scale_idx: int, shape: tuple[int]):
-        if len(shape) != self.ndim():
-            raise ValueError("Inconsistent dimensionality")
-        coords = []
-        scale = np.array(self.pixelResolution.dimensions) * self.scales[scale_idx]
-        for idx in range(self.ndim()):
-            n5_idx = self.ndim() - idx - 1
-            if self.axes is None:
-                name = f"dim_{idx}"
-            else:
-                name = self.axes[n5_idx]
-                coord_arr = self.coordinate_array(name)
-                if coords is not None:
-                    coords.append((name, coord_arr))
-                    continue
-
-                if not name:
-                    name = f"dim_{idx}"
-
-            coord_arr = np.arange(shape[idx], dtype=float) * scale[n5_idx]
-            coords.append((name, coord_arr, {"units": self.pixelResolution.unit}))
-            coords.append(
-                xr.DataArray(
-                    coord_arr,
-                    dims=(name,),
-                    name=name,
-                    attrs={"units": self.pixelResolution.unit},
-                )
-                # ).pint.quantify()
-            )
-
-        return coords
-
     def n_scales(self) -> int:
         return len(self.scales)
 
-    def dim_names(self) -> list[str]:
-        if self.axes is not None:
-            return self.axes[::-1]
-        return [f"dim_{n}" for n in range(self.ndim())]
+    def unit(self, n5_idx: int) -> str:
+        return self.pixelResolution.unit
+
+    @cached_property
+    def _reversed_scales(self) -> list[np.ndarray]:
+        dimensions = np.asarray(self.pixelResolution.dimensions)
+        return [(dimensions * s)[::-1].copy() for s in self.scales]
 
 
 class BigDataViewerMetadata(SharedMetadata):
@@ -120,75 +179,75 @@ class BigDataViewerMetadata(SharedMetadata):
     resolution: list[float]
     units: list[str]
 
-    @root_validator
-    def check_ndim(cls, values):
+    def __post_init__(self):
+        super().__post_init__()
+
         ndim = None
-        if values.get("axes") is not None:
-            ndim = len(values["axes"])
+        if self.axes is not None:
+            ndim = len(self.axes)
 
-        pr_ndim = len(values["resolution"])
+        pr_ndim = len(self.resolution)
         if ndim is None:
             ndim = pr_ndim
         elif ndim != pr_ndim:
             raise ValueError("Inconsistent dimensionality")
 
-        if ndim != len(values["units"]):
+        if ndim != len(self.units):
             raise ValueError("Inconsistent dimensionality")
 
-        for row in values["downsamplingFactors"]:
+        for row in self.downsamplingFactors:
             if len(row) != ndim:
                 raise ValueError("Inconsistent dimensionality")
 
-        return values
-
     def ndim(self):
         return len(self.resolution)
 
-    def to_coords(self, scale_idx: int, shape: tuple[int]):
-        if len(shape) != self.ndim():
-            raise ValueError("Inconsistent dimensionality")
-        coords = []
-        scale = np.array(self.resolution) * self.downsamplingFactors[scale_idx]
-        for idx in range(self.ndim()):
-            n5_idx = self.ndim() - idx - 1
-            if self.axes is None:
-                name = f"dim_{idx}"
-            else:
-                name = self.axes[n5_idx]
-                coord_arr = self.coordinate_array(name)
-                if coord_arr is not None:
-                    coords.append(
-                        xr.DataArray(
-                            coord_arr,
-                            dims=(name,),
-                            name=name,
-                        )
-                    )
-                    continue
-
-            if not name:
-                name = f"dim_{idx}"
-
-            coord_arr = np.arange(shape[idx], dtype=float) * scale[n5_idx]
-            coords.append(
-                xr.DataArray(
-                    coord_arr,
-                    dims=(name,),
-                    name=name,
-                    attrs={"units": self.units[n5_idx]},
-                )
-                # ).pint.quantify()
-            )
-
-        return coords
-
     def n_scales(self):
         return len(self.downsamplingFactors)
 
-    def dim_names(self) -> list[str]:
-        if self.axes is not None:
-            return self.axes[::-1]
-        return [f"dim_{n}" for n in range(self.ndim())]
+    def unit(self, n5_idx: int) -> str:
+        return self.units[n5_idx]
+
+    @cached_property
+    def _reversed_scales(self) -> list[np.ndarray]:
+        resolution = np.asarray(self.resolution)
+        return [(resolution * f)[::-1].copy() for f in self.downsamplingFactors]
+
+
+BDV_KEYS = frozenset(["downsamplingFactors", "resolution", "units"])
+
+
+def parse_metadata(attrs: dict) -> Union[BigDataViewerMetadata, N5ViewerMetadata]:
+    """Parse BigDataViewer or n5-viewer multiscale metadata.
+
+    Only attempts to parse as BigDataViewer metadata if the required keys are
+    present, so that n5-viewer metadata is not validated twice.
+
+    Parameters
+    ----------
+    attrs : dict
+        N5 group attributes.
+
+    Returns
+    -------
+    Union[BigDataViewerMetadata, N5ViewerMetadata]
+
+    Raises
+    ------
+    msgspec.ValidationError
+        If metadata is not compatible with either BigDataViewer or n5-viewer
+    """
+    if attrs.keys() >= BDV_KEYS:
+        try:
+            meta = msgspec.convert(attrs, BigDataViewerMetadata)
+            logger.debug("Found valid BigDataViewer metadata")
+            return meta
+        except msgspec.ValidationError:
+            pass
+
+    meta = msgspec.convert(attrs, N5ViewerMetadata)
+    logger.debug("Found valid N5ViewerMetadata")
+    return meta
 
 
 class NglN5Multiscale(MultiscaleBase):
@@ -198,54 +257,132 @@ class NglN5Multiscale(MultiscaleBase):
     optionally with neuroglancer extension metadata.
     """
 
-    def __init__(self, group: zarr.Group) -> None:
+    __slots__ = (
+        "group",
+        "metadata",
+        "lazy",
+        "coord_dtype",
+        "_arrays",
+        "_coords_cache",
+    )
+
+    def __init__(
+        self,
+        group: zarr.Group,
+        lazy: LazyMode = "auto",
+        coord_dtype: DTypeLike = np.float64,
+    ) -> None:
         """
         Parameters
         ----------
         group : zarr.Group
             Group from N5 store with either BigDataViewer or n5-viewer
             multiscale metadata, and N datasets named s0, s1, s2, ..., s{N-1}.
+        lazy : {"auto", "dask", "zarr"}, optional
+            How to wrap the array data (default "auto").
+            "dask" wraps it in a dask.Array;
+            "zarr" reads it into memory without dask;
+            "auto" uses "zarr" for local, single-chunk arrays of at most
+            utils.AUTO_ZARR_MAX_BYTES (16 MiB), and "dask" otherwise.
+        coord_dtype : numpy dtype, optional
+            Floating-point dtype of the coordinate arrays (default float64).
+            float32 halves their memory, but has only ~7 significant digits:
+            coordinates far from the origin may then not be evenly spaced
+            to within the default tolerances of ArrayInfo.from_xarray.
 
         Raises
         ------
         ValueError
             If backing store is not N5.
-        ValidationError
+        msgspec.ValidationError
             If metadata is not compatible with either BigDataViewer or n5-viewer
         """
         self.group: zarr.Group = group
-        if not isinstance(self.group.store, (zarr.N5FSStore, zarr.N5Store)):
+        if not isinstance(
+            unwrap_store(self.group.store), (zarr.N5FSStore, zarr.N5Store)
+        ):
             raise ValueError("NglN5Multiscale only supported for N5 stores")
 
-        self.metadata: Union[BigDataViewerMetadata, N5ViewerMetadata]
-
-        try:
-            self.metadata = BigDataViewerMetadata.parse_obj(self.group.attrs)
-            logger.debug("Found valid BigDataViewer metadata")
-        except ValidationError:
-            self.metadata = N5ViewerMetadata.parse_obj(self.group.attrs)
-            logger.debug("Found valid N5ViewerMetadata")
+        self.metadata: Union[BigDataViewerMetadata, N5ViewerMetadata] = parse_metadata(
+            self.group.attrs.asdict()
+        )
+        self.lazy: LazyMode = lazy
+        self.coord_dtype = np.dtype(coord_dtype)
+        self._arrays: dict[int, zarr.Array] = dict()
+        self._coords_cache: dict[int, xr.Coordinates] = dict()
 
     @classmethod
-    def from_paths(cls, container, group: str, store_kwargs=None, group_kwargs=None):
+    def from_paths(
+        cls,
+        container,
+        group: str,
+        store_kwargs=None,
+        group_kwargs=None,
+        lazy: LazyMode = "auto",
+        coord_dtype: DTypeLike = np.float64,
+        cache_size: Optional[int] = None,
+    ):
+        """Open a multiscale group from an N5 container.
+
+        Parameters
+        ----------
+        container : str
+            Path or URL of the N5 container.
+        group : str
+            Path to the multiscale group within the container.
+        store_kwargs : dict, optional
+            Passed to zarr.N5FSStore.
+        group_kwargs : dict, optional
+            Passed to zarr.open_group; mode defaults to "r".
+        lazy : {"auto", "dask", "zarr"}, optional
+            See NglN5Multiscale.
+        coord_dtype : numpy dtype, optional
+            See NglN5Multiscale.
+        cache_size : int, optional
+            If given, wrap remote stores in an LRU cache of this many bytes.
+
+        Returns
+        -------
+        NglN5Multiscale
+        """
         if store_kwargs is None:
             store_kwargs = dict()
         if group_kwargs is None:
             group_kwargs = dict()
-        store = zarr.N5FSStore(container, **store_kwargs)
+        store = cache_store(zarr.N5FSStore(container, **store_kwargs), cache_size)
         group_kwargs.setdefault("mode", "r")
         root = zarr.open_group(store, **group_kwargs)
-        return cls(root[group])
+        return cls(root[group], lazy, coord_dtype)
 
     def __len__(self) -> int:
         return self.metadata.n_scales()
 
     def _get_item(self, idx: int) -> xr.DataArray:
         super()._get_item(idx)
-        arr = self.group[f"s{idx}"]
-        coords = self.metadata.to_coords(idx, arr.shape)
-        d_arr = da.from_zarr(arr)
-        return xr.DataArray(d_arr, coords, name=arr.name, attrs=arr.attrs)
+        arr = self._get_array(idx)
+        coords = self._coords_for(idx, arr.shape)
+        d_arr = array_data(arr, self.lazy)
+        return xr.DataArray(
+            d_arr, coords, dims=tuple(coords.dims), name=arr.name, attrs=arr.attrs
+        )
+
+    def _is_open(self, idx: int) -> bool:
+        return idx in self._arrays
+
+    def _get_array(self, idx: int) -> zarr.Array:
+        arr = self._arrays.get(idx)
+        if arr is None:
+            arr = self._arrays[idx] = self.group[f"s{idx}"]
+        return arr
+
+    def _coords_for(self, idx: int, shape: tuple[int, ...]) -> xr.Coordinates:
+        coords = self._coords_cache.get(idx)
+        if coords is None:
+            coords = to_coordinates(
+                self.metadata.to_coords(idx, shape, self.coord_dtype)
+            )
+            self._coords_cache[idx] = coords
+        return coords
 
     def ndim(self) -> int:
         return self.metadata.ndim()
@@ -1,17 +1,44 @@
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+from numpy.typing import DTypeLike
 import zarr
-from xarray_ome_ngff import transforms_to_coords
-from pydantic_ome_ngff.latest import multiscales
+from zarr.storage import normalize_store_arg
 import xarray as xr
-import dask.array as da
 
-from .utils import UNITS_ATTR, OTHER_UNITS_ATTR
+from .utils import (
+    UNITS_ATTR,
+    OTHER_UNITS_ATTR,
+    LazyMode,
+    array_data,
+    cache_store,
+    to_coordinates,
+)
 from .base import MultiscaleBase
 
+if TYPE_CHECKING:
+    from pydantic_ome_ngff.latest import multiscales
+
 
 class OmeMultiscale(MultiscaleBase):
     """OME-NGFF multiscale dataset."""
 
-    def __init__(self, group: zarr.Group, index=0) -> None:
+    __slots__ = (
+        "group",
+        "multiscales",
+        "lazy",
+        "coord_dtype",
+        "_arrays",
+        "_coords_cache",
+    )
+
+    def __init__(
+        self,
+        group: zarr.Group,
+        index=0,
+        lazy: LazyMode = "auto",
+        coord_dtype: DTypeLike = np.float64,
+    ) -> None:
         """
         Parameters
         ----------
@@ -20,34 +47,111 @@ class OmeMultiscale(MultiscaleBase):
         index : int, optional
             Groups can contain several scale pyramids.
             This selects which one to open (default 0).
+        lazy : {"auto", "dask", "zarr"}, optional
+            How to wrap the array data (default "auto").
+            "dask" wraps it in a dask.Array;
+            "zarr" reads it into memory without dask;
+            "auto" uses "zarr" for local, single-chunk arrays of at most
+            utils.AUTO_ZARR_MAX_BYTES (16 MiB), and "dask" otherwise.
+        coord_dtype : numpy dtype, optional
+            Floating-point dtype of the coordinate arrays (default float64).
+            float32 halves their memory, but has only ~7 significant digits:
+            coordinates far from the origin may then not be evenly spaced
+            to within the default tolerances of ArrayInfo.from_xarray.
         """
+        from pydantic_ome_ngff.latest.multiscales import MultiscaleAttrs
+
         self.group: zarr.Group = group
-        mgrp = multiscales.MultiscaleAttrs.parse_obj(self.group.attrs)
-        self.multiscales: multiscales.Multiscale = mgrp.multiscales[index]
+        mgrp = MultiscaleAttrs.parse_obj(self.group.attrs)
+        self.multiscales: "multiscales.Multiscale" = mgrp.multiscales[index]
+        self.lazy: LazyMode = lazy
+        self.coord_dtype = np.dtype(coord_dtype)
+        self._arrays: dict[int, zarr.Array] = dict()
+        self._coords_cache: dict[int, xr.Coordinates] = dict()
 
     @classmethod
-    def from_paths(cls, container, group=None, index=0):
-        grp = zarr.open_group(container, mode="r", path=group)
-        return cls(grp, index)
+    def from_paths(
+        cls,
+        container,
+        group=None,
+        index=0,
+        lazy: LazyMode = "auto",
+        coord_dtype: DTypeLike = np.float64,
+        cache_size: Optional[int] = None,
+        consolidated: bool = False,
+    ):
+        """Open a multiscale group from a zarr container.
+
+        Parameters
+        ----------
+        container : str
+            Path or URL of the zarr container.
+        group : str, optional
+            Path to the multiscale group within the container (default root).
+        index : int, optional
+            See OmeMultiscale.
+        lazy : {"auto", "dask", "zarr"}, optional
+            See OmeMultiscale.
+        coord_dtype : numpy dtype, optional
+            See OmeMultiscale.
+        cache_size : int, optional
+            If given, wrap remote stores in an LRU cache of this many bytes.
+        consolidated : bool, optional
+            Whether to read all metadata at once from the container's
+            consolidated metadata (default False),
+            which must already have been written with zarr.consolidate_metadata.
+
+        Returns
+        -------
+        OmeMultiscale
+        """
+        store = cache_store(normalize_store_arg(container, mode="r"), cache_size)
+        if consolidated:
+            grp = zarr.open_consolidated(store, mode="r", path=group)
+        else:
+            grp = zarr.open_group(store, mode="r", path=group)
+        return cls(grp, index, lazy, coord_dtype)
 
     def __len__(self) -> int:
         return len(self.multiscales.datasets)
 
     def _get_item(self, idx: int) -> xr.DataArray:
         super()._get_item(idx)
-        ds = self.multiscales.datasets[idx]
-        transforms = ds.coordinateTransformations
-        arr = self.group[ds.path]
-        coords = transmute_coords(
-            transforms_to_coords(
-                self.multiscales.axes,
-                transforms,
-                arr.shape,
-            )
+        arr = self._get_array(idx)
+        coords = self._coords_for(idx, arr.shape)
+        d_arr = array_data(arr, self.lazy)
+
+        return xr.DataArray(
+            d_arr, coords, dims=tuple(coords.dims), name=arr.name, attrs=arr.attrs
         )
-        d_arr = da.from_zarr(arr)
 
-        return xr.DataArray(d_arr, coords, name=arr.name, attrs=arr.attrs)
+    def _is_open(self, idx: int) -> bool:
+        return idx in self._arrays
+
+    def _get_array(self, idx: int) -> zarr.Array:
+        arr = self._arrays.get(idx)
+        if arr is None:
+            path = self.multiscales.datasets[idx].path
+            arr = self._arrays[idx] = self.group[path]
+        return arr
+
+    def _coords_for(self, idx: int, shape: tuple[int, ...]) -> xr.Coordinates:
+        coords = self._coords_cache.get(idx)
+        if coords is None:
+            from xarray_ome_ngff import transforms_to_coords
+
+            coords = transmute_coords(
+                transforms_to_coords(
+                    self.multiscales.axes,
+                    self.multiscales.datasets[idx].coordinateTransformations,
+                    shape,
+                )
+            )
+            coords = to_coordinates(
+                [c.astype(self.coord_dtype, copy=False) for c in coords]
+            )
+            self._coords_cache[idx] = coords
+        return coords
 
     def ndim(self):
         return len(self.multiscales.axes)
@@ -71,7 +175,5 @@ def transmute_coords(coords: list[xr.DataArray]) -> list[xr.DataArray]:
             c.attrs[UNITS_ATTR] = c.attrs[OTHER_UNITS_ATTR]
             del c.attrs[OTHER_UNITS_ATTR]
 
-        # if "units" in c.attrs:
-        #     c = c.pint.quantify()
         out.append(c)
     return out
@@ -1,153 +1,349 @@
-from typing import Hashable, NamedTuple, Optional, Union
+from functools import cache
+from typing import TYPE_CHECKING, Hashable, Literal, NamedTuple, Optional
 import xarray as xr
 import numpy as np
-from pydantic_ome_ngff.latest import coordinateTransformations, multiscales
+import zarr
 
-UNITS_ATTR = "unit"
-OTHER_UNITS_ATTR = "units"
+if TYPE_CHECKING:
+    from pydantic_ome_ngff.latest import coordinateTransformations, multiscales
+
+# key used by pint-xarray
+UNITS_ATTR = "units"
+OTHER_UNITS_ATTR = "unit"
+
+LazyMode = Literal["auto", "dask", "zarr"]
+
+# largest array which lazy="auto" reads eagerly, rather than wrapping in dask
+AUTO_ZARR_MAX_BYTES = 2**24
+
+
+def unwrap_store(store):
+    """Get the store underlying any caching layers."""
+    while isinstance(store, zarr.LRUStoreCache):
+        store = store._store
+    return store
+
+
+def is_local_store(store) -> bool:
+    """Whether a zarr store is backed by the local file system."""
+    store = unwrap_store(store)
+    if isinstance(store, zarr.DirectoryStore):
+        return True
+    if isinstance(store, zarr.storage.FSStore):
+        protocol = store.fs.protocol
+        if isinstance(protocol, str):
+            protocol = (protocol,)
+        return "file" in protocol
+    return False
+
+
+def cache_store(store, cache_size: Optional[int] = None):
+    """Wrap a remote store in an in-memory LRU cache.
+
+    Local stores are returned unchanged, as caching tends to slow them down.
+
+    Parameters
+    ----------
+    store : zarr store
+    cache_size : int, optional
+        Maximum size of the cache in bytes.
+        If None (default), the store is not cached.
+
+    Returns
+    -------
+    zarr store
+    """
+    if cache_size is None or is_local_store(store):
+        return store
+    return zarr.LRUStoreCache(store, max_size=cache_size)
+
+
+def array_data(arr: zarr.Array, lazy: LazyMode = "auto"):
+    """Wrap a zarr array for use as the data of an xarray.DataArray.
+
+    Parameters
+    ----------
+    arr : zarr.Array
+    lazy : {"auto", "dask", "zarr"}, optional
+        "dask" wraps the array in a dask.Array.
+        "zarr" reads the array directly with zarr, into memory;
+        this skips building a dask graph, which is only worthwhile for small arrays.
+        "auto" (default) uses "zarr" for local arrays with a single chunk
+        and at most AUTO_ZARR_MAX_BYTES (16 MiB), and "dask" otherwise.
+
+    Returns
+    -------
+    Union[dask.array.Array, np.ndarray]
+    """
+    if lazy == "auto":
+        if (
+            arr.nchunks <= 1
+            and arr.nbytes <= AUTO_ZARR_MAX_BYTES
+            and is_local_store(arr.chunk_store)
+        ):
+            lazy = "zarr"
+        else:
+            lazy = "dask"
+
+    if lazy == "zarr":
+        return arr[...]
+    if lazy == "dask":
+        import dask.array as da
+
+        return da.from_zarr(arr, chunks=arr.chunks, inline_array=True)
+    raise ValueError(f"Unknown lazy mode {lazy!r}")
 
 
 def reverse_coordinate_transformation(
-    coord_trans: coordinateTransformations.CoordinateTransform, inplace=True
+    coord_trans: "coordinateTransformations.CoordinateTransform", inplace=True
 ):
     """Reverse the dimensions of a CoordinateTransform.
 
     e.g. for switching between N5 and Zarr dimension order conventions.
+    If not inplace, the original is shallow-copied
+    with only the reversed vector replaced.
     """
-    if not inplace:
-        coord_trans = coord_trans.copy(deep=True)
+    from pydantic_ome_ngff.latest import coordinateTransformations
 
     if isinstance(coord_trans, coordinateTransformations.VectorScaleTransform):
-        coord_trans.scale.reverse()
+        field = "scale"
     elif isinstance(coord_trans, coordinateTransformations.VectorTranslationTransform):
-        coord_trans.translation.reverse()
+        field = "translation"
+    elif inplace:
+        return coord_trans
+    else:
+        return coord_trans.copy()
 
-    return coord_trans
+    vector = getattr(coord_trans, field)
+    if inplace:
+        vector.reverse()
+        return coord_trans
+    return coord_trans.copy(update={field: vector[::-1]})
 
 
-def reverse_multiscale(multiscale: multiscales.Multiscale, inplace=True):
+def reverse_multiscale(multiscale: "multiscales.Multiscale", inplace=True):
     """Reverse the dimensions of a Multiscale.
 
     e.g. for switching between N5 and Zarr dimension order conventions.
+    If not inplace, only the reversed fields are copied;
+    the rest are shared with the original.
     """
-    if not inplace:
-        multiscale = multiscale.copy(deep=True)
-
-    multiscale.axes.reverse()
-
-    if multiscale.coordinateTransformations is not None:
-        for ct in multiscale.coordinateTransformations:
-            reverse_coordinate_transformation(ct)
-
-    for dataset in multiscale.datasets:
-        for ct in dataset.coordinateTransformations:
-            reverse_coordinate_transformation(ct)
+    if inplace:
+        multiscale.axes.reverse()
+
+        if multiscale.coordinateTransformations is not None:
+            for ct in multiscale.coordinateTransformations:
+                reverse_coordinate_transformation(ct)
+
+        for dataset in multiscale.datasets:
+            for ct in dataset.coordinateTransformations:
+                reverse_coordinate_transformation(ct)
+
+        return multiscale
+
+    coord_transes = multiscale.coordinateTransformations
+    if coord_transes is not None:
+        coord_transes = [
+            reverse_coordinate_transformation(ct, False) for ct in coord_transes
+        ]
+
+    datasets = [
+        dataset.copy(
+            update={
+                "coordinateTransformations": [
+                    reverse_coordinate_transformation(ct, False)
+                    for ct in dataset.coordinateTransformations
+                ]
+            }
+        )
+        for dataset in multiscale.datasets
+    ]
 
-    return multiscale
+    return multiscale.copy(
+        update={
+            "axes": multiscale.axes[::-1],
+            "coordinateTransformations": coord_transes,
+            "datasets": datasets,
+        }
+    )
 
 
 def reverse_multiscale_attrs(
-    multiscale_attrs: multiscales.MultiscaleAttrs, inplace=True
+    multiscale_attrs: "multiscales.MultiscaleAttrs", inplace=True
 ):
     """Reverse the dimensions of a MultiscaleAttrs.
 
     e.g. for switching between N5 and Zarr dimension order conventions.
+    If not inplace, only the reversed fields are copied;
+    the rest are shared with the original.
     """
-    if not inplace:
-        multiscale_attrs = multiscale_attrs.copy(deep=True)
-
-    for mscale in multiscale_attrs.multiscales:
-        reverse_multiscale(mscale)
-
-    return multiscale_attrs
+    if inplace:
+        for mscale in multiscale_attrs.multiscales:
+            reverse_multiscale(mscale)
+        return multiscale_attrs
+
+    return multiscale_attrs.copy(
+        update={
+            "multiscales": [
+                reverse_multiscale(mscale, False)
+                for mscale in multiscale_attrs.multiscales
+            ]
+        }
+    )
+
+
+def to_coordinates(coords: list[xr.DataArray]) -> xr.Coordinates:
+    """Combine coordinate arrays into a read-only, reusable xarray.Coordinates.
+
+    Indexes are built once here, rather than every time
+    the coordinates are used to construct a DataArray.
+
+    Parameters
+    ----------
+    coords : list[xr.DataArray]
+
+    Returns
+    -------
+    xr.Coordinates
+    """
+    for c in coords:
+        if isinstance(c.data, np.ndarray):
+            c.data.setflags(write=False)
+    return xr.Coordinates({c.dims[0]: c for c in coords})
 
 
 DEFAULT_RTOL = 1e-5
 DEFAULT_ATOL = 1e-8
 
+# below this length, numba's dispatch overhead outweighs the single-pass speedup
+JIT_MIN_SIZE = 10_000
+
+
+def _regular_step(values: np.ndarray, rtol: float, atol: float) -> float:
+    """Step between regularly-spaced values, or NaN if they are irregular.
+
+    Equivalent to checking ``np.allclose(np.diff(values), step, rtol, atol)``,
+    in a single pass without temporaries.
+    """
+    step = values[1] - values[0]
+    tol = atol + rtol * abs(step)
+    for i in range(2, len(values)):
+        if not abs(values[i] - values[i - 1] - step) <= tol:
+            return np.nan
+    return step
+
+
+@cache
+def _jit_regular_step():
+    """JIT-compiled ``_regular_step``, or None if numba is not installed."""
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    return njit(cache=True)(_regular_step)
+
 
 class ArrayInfo(NamedTuple):
-    offset: dict[Hashable, Optional[float]]
-    resolution: dict[Hashable, Optional[float]]
-    units: dict[Hashable, Optional[str]]
-    shape: dict[Hashable, int]
-    order: list[Hashable]
+    """Regular grid information about an array's coordinates.
+
+    All fields are in the array's dimension order;
+    offset and resolution are NaN for dimensions without numeric coordinates.
+    """
 
-    def _ordered(self, d: dict):
-        return [d[o] for o in self.order]
+    order: tuple[Hashable, ...]
+    offset: np.ndarray
+    resolution: np.ndarray
+    shape: np.ndarray
+    units: tuple[Optional[str], ...]
 
-    def ordered_offset(self):
-        return self._ordered(self.offset)
+    def ordered_offset(self) -> np.ndarray:
+        return self.offset
 
-    def ordered_resolution(self):
-        return self._ordered(self.resolution)
+    def ordered_resolution(self) -> np.ndarray:
+        return self.resolution
 
-    def ordered_units(self):
-        return self._ordered(self.units)
+    def ordered_units(self) -> tuple[Optional[str], ...]:
+        return self.units
 
-    def ordered_shape(self):
-        return self._ordered(self.shape)
+    def ordered_shape(self) -> np.ndarray:
+        return self.shape
 
     def reverse_order(self):
         return type(self)(
-            self.offset, self.resolution, self.units, self.shape, self.order[::-1]
+            self.order[::-1],
+            self.offset[::-1],
+            self.resolution[::-1],
+            self.shape[::-1],
+            self.units[::-1],
         )
 
     @classmethod
     def from_xarray(
         cls, arr: xr.DataArray, rel_abs_tolerances: Optional[tuple[float, float]] = None
     ):
-        offset = dict()
-        resolution = dict()
-        units = dict()
-        shape = dict()
         order = []
-
-        for d, c_arr in arr.coords.items():
+        offset = []
+        resolution = []
+        shape = []
+        units = []
+
+        # bare Variables avoid the overhead of DataArray attribute access
+        variables = arr.coords.variables
+        for d in arr.dims:
+            var = variables.get(d)
             order.append(d)
-            shape[d] = len(c_arr)
-            units[d] = c_arr.attrs.get(UNITS_ATTR)
+            shape.append(arr.sizes[d])
+            units.append(None if var is None else var.attrs.get(UNITS_ATTR))
 
-            if not np.issubdtype(c_arr.dtype, np.number):
-                offset[d] = None
-                resolution[d] = None
+            if var is None or not np.issubdtype(var.dtype, np.number):
+                offset.append(np.nan)
+                resolution.append(np.nan)
                 continue
 
-            offset[d] = c_arr[0]
+            values = var.values
+            offset.append(values[0])
 
             if rel_abs_tolerances is None:
-                res = c_arr[1] - c_arr[0]
+                res = values[1] - values[0]
             else:
-                diffs = np.unique(np.diff(c_arr))
                 rtol, atol = rel_abs_tolerances
                 if rtol is None:
                     rtol = DEFAULT_RTOL
                 if atol is None:
                     atol = DEFAULT_ATOL
 
-                if diffs.ptp() > atol + np.abs(diffs.min()) * rtol:
-                    raise ValueError("Resolution is inconsistent")
+                regular_step = None
+                if len(values) > JIT_MIN_SIZE:
+                    regular_step = _jit_regular_step()
 
-                res = diffs[0]
+                if regular_step is not None:
+                    res = regular_step(np.ascontiguousarray(values), rtol, atol)
+                    if np.isnan(res):
+                        raise ValueError("Resolution is inconsistent")
+                else:
+                    diffs = np.diff(values)
+                    res = diffs[0]
+                    if not np.allclose(diffs, res, rtol=rtol, atol=atol):
+                        raise ValueError("Resolution is inconsistent")
 
             if res <= 0:
                 raise ValueError("Resolution is not monotonically increasing")
 
-            resolution[d] = res
+            resolution.append(res)
 
-        return cls(offset, resolution, units, shape, order)
+        return cls(
+            tuple(order),
+            np.asarray(offset, dtype=np.float64),
+            np.asarray(resolution, dtype=np.float64),
+            np.asarray(shape, dtype=np.int64),
+            tuple(units),
+        )
 
     @property
-    def shape_world(self) -> dict[Hashable, Union[float, int]]:
-        out = dict()
-        for k in self.order:
-            s = self.shape[k]
-            r = self.resolution[k]
-            if r is None:
-                out[k] = s
-            else:
-                out[k] = (s + 1) * r
-        return out
+    def shape_world(self) -> np.ndarray:
+        return np.where(
+            np.isnan(self.resolution), self.shape, (self.shape + 1) * self.resolution
+        )
 
-    def ordered_shape_world(self):
-        return self._ordered(self.shape_world)
+    def ordered_shape_world(self) -> np.ndarray:
+        return self.shape_world
@@ -0,0 +1,72 @@
+import pytest
+import zarr
+
+N5V_ATTRS = {
+    "scales": [[1, 1, 1], [2, 2, 2]],
+    "pixelResolution": {"unit": "nm", "dimensions": [4, 4, 40]},
+}
+
+BDV_ATTRS = {
+    "downsamplingFactors": [[1, 1, 1], [2, 2, 2]],
+    "resolution": [4, 4, 40],
+    "units": ["nm", "nm", "nm"],
+    "axes": ["x", "y", "z"],
+}
+
+SHAPES = [(10, 20, 30), (5, 10, 15)]
+
+
+def make_n5_multiscale(root: zarr.Group, name: str, attrs: dict) -> zarr.Group:
+    g = root.create_group(name)
+    g.attrs.update(attrs)
+    for idx, shape in enumerate(SHAPES):
+        g.zeros(f"s{idx}", shape=shape, chunks=(5, 10, 15))
+    return g
+
+
+@pytest.fixture
+def n5_root(tmp_path) -> zarr.Group:
+    store = zarr.N5Store(tmp_path / "data.n5")
+    root = zarr.open_group(store, mode="w")
+    make_n5_multiscale(root, "n5v", N5V_ATTRS)
+    make_n5_multiscale(root, "bdv", BDV_ATTRS)
+    return root
+
+
+OME_ATTRS = {
+    "multiscales": [
+        {
+            "version": "0.4",
+            "axes": [
+                {"name": "z", "type": "space", "unit": "nanometer"},
+                {"name": "y", "type": "space", "unit": "nanometer"},
+                {"name": "x", "type": "space", "unit": "nanometer"},
+            ],
+            "datasets": [
+                {
+                    "path": "s0",
+                    "coordinateTransformations": [
+                        {"type": "scale", "scale": [40, 4, 4]},
+                    ],
+                },
+                {
+                    "path": "s1",
+                    "coordinateTransformations": [
+                        {"type": "scale", "scale": [80, 8, 8]},
+                        {"type": "translation", "translation": [20, 2, 2]},
+                    ],
+                },
+            ],
+        }
+    ]
+}
+
+
+@pytest.fixture
+def ome_root(tmp_path) -> zarr.Group:
+    root = zarr.open_group(tmp_path / "data.zarr", mode="w")
+    g = root.create_group("ome")
+    g.attrs.update(OME_ATTRS)
+    for idx, shape in enumerate(SHAPES):
+        g.zeros(f"s{idx}", shape=shape[::-1], chunks=(15, 10, 5))
+    return root
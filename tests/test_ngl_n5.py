@@ -0,0 +1,144 @@
+import dask.array as da
+import msgspec
+import numpy as np
+import pytest
+import zarr
+
+from multiscale_read import NglN5Multiscale, base, utils
+from multiscale_read.ngl_n5 import BigDataViewerMetadata, N5ViewerMetadata
+from multiscale_read.utils import ArrayInfo
+
+from .conftest import BDV_ATTRS, N5V_ATTRS, make_n5_multiscale
+
+
+def test_n5v_to_coords():
+    meta = msgspec.convert(N5V_ATTRS, N5ViewerMetadata)
+    coords = meta.to_coords(1, (2, 3, 4))
+
+    assert [c.name for c in coords] == ["dim_0", "dim_1", "dim_2"]
+    assert meta.dim_names() == ["dim_0", "dim_1", "dim_2"]
+    np.testing.assert_allclose(coords[0], [0, 80])
+    np.testing.assert_allclose(coords[2], [0, 8, 16, 24])
+    assert all(c.attrs["units"] == "nm" for c in coords)
+
+
+def test_n5v_to_coords_axes():
+    attrs = dict(N5V_ATTRS, axes=["x", "y", "z"])
+    meta = msgspec.convert(attrs, N5ViewerMetadata)
+    coords = meta.to_coords(0, (2, 3, 4))
+
+    assert [c.name for c in coords] == ["z", "y", "x"]
+    assert meta.dim_names() == ["z", "y", "x"]
+    np.testing.assert_allclose(coords[0], [0, 40])
+
+
+def test_coordinate_arrays():
+    attrs = dict(BDV_ATTRS, coordinateArrays={"z": ["a", "b"]})
+    meta = msgspec.convert(attrs, BigDataViewerMetadata)
+    coords = meta.to_coords(0, (2, 3, 4))
+
+    assert len(coords) == 3
+    assert list(coords[0].values) == ["a", "b"]
+    np.testing.assert_allclose(coords[1], [0, 4, 8])
+
+
+def test_invalid_metadata():
+    attrs = dict(N5V_ATTRS, scales=[[1, 1]])
+    with pytest.raises(msgspec.ValidationError):
+        msgspec.convert(attrs, N5ViewerMetadata)
+
+
+@pytest.mark.parametrize(
+    ["name", "meta_type"],
+    [("n5v", N5ViewerMetadata), ("bdv", BigDataViewerMetadata)],
+)
+def test_multiscale(n5_root, name, meta_type):
+    ms = NglN5Multiscale(n5_root[name])
+    assert isinstance(ms.metadata, meta_type)
+    assert len(ms) == 2
+
+    arr = ms[1]
+    assert arr.shape == (5, 10, 15)
+    assert all(arr.coords[d].attrs["units"] == "nm" for d in arr.dims)
+    assert ArrayInfo.from_xarray(arr).units == ("nm",) * 3
+    np.testing.assert_allclose(arr.coords[arr.dims[0]][:2], [0, 80])
+
+
+@pytest.mark.parametrize(
+    ["lazy", "idx", "expected"],
+    [
+        ("auto", 0, da.Array),
+        ("auto", 1, np.ndarray),
+        ("dask", 1, da.Array),
+        ("zarr", 0, np.ndarray),
+    ],
+)
+def test_lazy(n5_root, lazy, idx, expected):
+    ms = NglN5Multiscale(n5_root["bdv"], lazy=lazy)
+    assert isinstance(ms[idx].data, expected)
+
+
+def test_lazy_auto_size_limit(n5_root, monkeypatch):
+    ms = NglN5Multiscale(n5_root["bdv"])
+    monkeypatch.setattr(utils, "AUTO_ZARR_MAX_BYTES", ms._get_array(1).nbytes - 1)
+    assert isinstance(ms[1].data, da.Array)
+
+
+def test_getitem(n5_root):
+    ms = NglN5Multiscale(n5_root["bdv"])
+    assert ms[-1].shape == ms[1].shape
+    assert ms[np.int64(1)].shape == ms[1].shape
+    assert [a.shape for a in ms[::-1]] == [(5, 10, 15), (10, 20, 30)]
+
+    with pytest.raises(IndexError):
+        ms[2]
+    with pytest.raises(IndexError):
+        ms[-3]
+    with pytest.raises(TypeError):
+        ms["s0"]
+
+
+def test_prefetch(n5_root):
+    ms = NglN5Multiscale(n5_root["bdv"])
+    ms.prefetch([-1])
+    assert list(ms._arrays) == [1]
+
+    ms.prefetch()
+    assert sorted(ms._arrays) == [0, 1]
+    assert ms[0].name == ms._arrays[0].name
+
+    with pytest.raises(IndexError):
+        ms.prefetch([2])
+
+
+def test_prefetch_skips_open(n5_root, monkeypatch):
+    ms = NglN5Multiscale(n5_root["bdv"])
+    ms.prefetch()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("thread pool should not be started")
+
+    monkeypatch.setattr(base, "ThreadPoolExecutor", fail)
+    assert len(ms[:]) == 2
+
+
+def test_cache_size():
+    url = "memory://test_cache_size/data.n5"
+    root = zarr.open_group(zarr.N5FSStore(url), mode="w")
+    make_n5_multiscale(root, "bdv", BDV_ATTRS)
+
+    ms = NglN5Multiscale.from_paths(url, "bdv", cache_size=2**20)
+    assert isinstance(ms.group.store, zarr.LRUStoreCache)
+    assert ms[1].shape == (5, 10, 15)
+
+
+def test_slots(n5_root):
+    ms = NglN5Multiscale(n5_root["bdv"])
+    assert not hasattr(ms, "__dict__")
+
+
+def test_coord_dtype(n5_root):
+    ms = NglN5Multiscale(n5_root["bdv"], coord_dtype=np.float32)
+    arr = ms[1]
+    assert all(arr.coords[d].dtype == np.float32 for d in arr.dims)
+    np.testing.assert_allclose(arr.coords["z"][:2], [0, 80])
@@ -0,0 +1,33 @@
+import numpy as np
+import zarr
+
+from multiscale_read import OmeMultiscale
+from multiscale_read.utils import UNITS_ATTR, ArrayInfo
+
+
+def test_multiscale(ome_root):
+    ms = OmeMultiscale(ome_root["ome"])
+    assert len(ms) == 2
+    assert ms.ndim() == 3
+
+    arr = ms[1]
+    assert arr.dims == ("z", "y", "x")
+    assert arr.shape == (15, 10, 5)
+    np.testing.assert_allclose(arr.coords["z"][:2], [20, 100])
+    assert arr.coords["z"].attrs["units"] == "nanometer"
+    assert "unit" not in arr.coords["z"].attrs
+    assert ArrayInfo.from_xarray(arr).units == ("nanometer",) * 3
+
+
+def test_coord_dtype(ome_root):
+    ms = OmeMultiscale(ome_root["ome"], coord_dtype=np.float32)
+    arr = ms[1]
+    assert arr.coords["z"].dtype == np.float32
+    assert arr.coords["z"].attrs[UNITS_ATTR] == "nanometer"
+
+
+def test_consolidated(ome_root):
+    zarr.consolidate_metadata(ome_root.store)
+    ms = OmeMultiscale.from_paths(ome_root.store.path, "ome", consolidated=True)
+    assert [a.shape for a in ms[:]] == [(30, 20, 10), (15, 10, 5)]
+    assert isinstance(ms[1].data, np.ndarray)
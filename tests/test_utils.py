@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+import xarray as xr
+import zarr
+
+from multiscale_read.utils import (
+    DEFAULT_ATOL,
+    DEFAULT_RTOL,
+    JIT_MIN_SIZE,
+    ArrayInfo,
+    _regular_step,
+    cache_store,
+    reverse_multiscale_attrs,
+)
+
+from .conftest import OME_ATTRS
+
+
+def make_array(**coords):
+    shape = tuple(len(c) for c in coords.values())
+    return xr.DataArray(np.zeros(shape), coords=coords, dims=tuple(coords))
+
+
+def test_array_info():
+    arr = make_array(y=np.arange(3) * 2.0, x=np.arange(4) * 0.5 + 1)
+    info = ArrayInfo.from_xarray(arr, (None, None))
+
+    assert info.order == ("y", "x")
+    np.testing.assert_allclose(info.ordered_offset(), [0, 1])
+    np.testing.assert_allclose(info.ordered_resolution(), [2, 0.5])
+    np.testing.assert_array_equal(info.ordered_shape(), [3, 4])
+    assert info.ordered_units() == (None, None)
+
+    rev = info.reverse_order()
+    assert rev.order == ("x", "y")
+    np.testing.assert_allclose(rev.ordered_resolution(), [0.5, 2])
+    np.testing.assert_array_equal(rev.ordered_shape(), [4, 3])
+
+
+def test_array_info_non_numeric():
+    arr = make_array(c=["r", "g"], x=np.arange(3) * 2.0)
+    info = ArrayInfo.from_xarray(arr)
+    assert np.isnan(info.resolution[0])
+    np.testing.assert_allclose(info.shape_world, [2, 8])
+
+
+def test_array_info_transposed():
+    arr = make_array(z=np.arange(2.0), y=np.arange(3.0), x=np.arange(4.0) * 2)
+    info = ArrayInfo.from_xarray(arr.transpose())
+
+    assert info.order == ("x", "y", "z")
+    np.testing.assert_array_equal(info.ordered_shape(), [4, 3, 2])
+    np.testing.assert_allclose(info.ordered_resolution(), [2, 1, 1])
+
+
+def test_array_info_scalar_coord():
+    arr = make_array(y=np.arange(3.0), x=np.arange(4.0)).isel(x=0)
+    info = ArrayInfo.from_xarray(arr)
+
+    assert info.order == ("y",)
+    np.testing.assert_array_equal(info.ordered_shape(), [3])
+
+
+def test_array_info_inconsistent():
+    arr = make_array(x=np.array([0, 1, 3.0]))
+    with pytest.raises(ValueError, match="inconsistent"):
+        ArrayInfo.from_xarray(arr, (None, None))
+
+
+def test_array_info_decreasing():
+    arr = make_array(x=np.array([3, 2, 1.0]))
+    with pytest.raises(ValueError, match="monotonically"):
+        ArrayInfo.from_xarray(arr)
+
+
+@pytest.mark.parametrize("size", [10, JIT_MIN_SIZE + 1])
+def test_array_info_large(size):
+    coord = np.arange(size) * 0.25
+    info = ArrayInfo.from_xarray(make_array(x=coord), (None, None))
+    np.testing.assert_allclose(info.ordered_resolution(), [0.25])
+
+    coord[-1] += 1
+    with pytest.raises(ValueError, match="inconsistent"):
+        ArrayInfo.from_xarray(make_array(x=coord), (None, None))
+
+
+def test_regular_step():
+    assert _regular_step(np.arange(5) * 2.0, DEFAULT_RTOL, DEFAULT_ATOL) == 2
+    assert np.isnan(_regular_step(np.array([0, 1, 3.0]), DEFAULT_RTOL, DEFAULT_ATOL))
+
+
+def test_cache_store(tmp_path):
+    local = zarr.DirectoryStore(tmp_path)
+    assert cache_store(local, 1024) is local
+
+    remote = zarr.storage.FSStore("memory://test_cache_store")
+    assert cache_store(remote) is remote
+    assert isinstance(cache_store(remote, 1024), zarr.LRUStoreCache)
+
+
+@pytest.mark.parametrize("inplace", [True, False])
+def test_reverse_multiscale_attrs(inplace):
+    from pydantic_ome_ngff.latest.multiscales import MultiscaleAttrs
+
+    attrs = MultiscaleAttrs.parse_obj(OME_ATTRS)
+    rev = reverse_multiscale_attrs(attrs, inplace)
+    assert (rev is attrs) == inplace
+
+    mscale = rev.multiscales[0]
+    assert [ax.name for ax in mscale.axes] == ["x", "y", "z"]
+    ct_scale, ct_translation = mscale.datasets[1].coordinateTransformations
+    assert ct_scale.scale == [8, 8, 80]
+    assert ct_translation.translation == [2, 2, 20]
+
+    if not inplace:
+        orig = attrs.multiscales[0]
+        assert [ax.name for ax in orig.axes] == ["z", "y", "x"]
+        assert orig.datasets[1].coordinateTransformations[0].scale == [80, 8, 8]